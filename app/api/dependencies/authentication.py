@@ -4,7 +4,7 @@ from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 
 from app.schemas.user import UserBase
-from app.services.pegawai_service import PegawaiService
+from app.services.pegawai_service import PegawaiService, get_pegawai_service
 from app.utils import exceptions
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/auth/login", auto_error=False)
@@ -34,13 +34,13 @@ class AuthHandler:
             raise exceptions.UnauthorizedError
 
         # get user info setelah mendapatkan token
-        user_info = await self.pegawai_service.map_to_pegawai_info(payload["user"])
+        user_info = self.pegawai_service.map_to_pegawai_info(payload["user"])
         return payload, user_info
 
 
 async def validate_token(
     token: str = Depends(oauth2_scheme),
-    pegawai_service: PegawaiService = Depends(PegawaiService),
+    pegawai_service: PegawaiService = Depends(get_pegawai_service),
 ):
     """verifikasi token ke service pegawai
 
@@ -48,7 +48,7 @@ async def validate_token(
         token (str, optional): Token yang akan diverifikasi. Defaults to
             Depends(oauth2_scheme).
         pegawai_service (PegawaiService, optional): Service pegawai. Defaults to
-            Depends(PegawaiService).
+            Depends(get_pegawai_service).
 
     Raises:
         unauthenticated_user_exception: Jika terjadi kesalahan saat memverifikasi
@@ -67,7 +67,9 @@ async def validate_token(
     return token
 
 
-async def auth_handler(pegawai_service: PegawaiService = Depends(PegawaiService)):
+async def auth_handler(
+    pegawai_service: PegawaiService = Depends(get_pegawai_service),
+):
     """Dependency untuk menginisialisasi AuthHandler."""
 
     return AuthHandler(pegawai_service)
@@ -8,6 +8,7 @@ from app.services.comment_service import CommentService
 from app.services.dashboard_service import DashboardService
 from app.services.milestone_service import MilestoneService
 from app.services.notification_service import NotificationService
+from app.services.pegawai_service import PegawaiService, get_pegawai_service
 from app.services.project_service import ProjectService
 from app.services.task_service import TaskService
 
@@ -29,9 +30,12 @@ def get_dashboard_service(
     return DashboardService(uow)
 
 
-def get_comment_service(uow: UnitOfWork = Depends(get_uow)) -> CommentService:
+def get_comment_service(
+    uow: UnitOfWork = Depends(get_uow),
+    pegawai_service: PegawaiService = Depends(get_pegawai_service),
+) -> CommentService:
     """Mendapatkan layanan komentar."""
-    return CommentService(uow)
+    return CommentService(uow, pegawai_service=pegawai_service)
 
 
 def get_attachment_service(uow: UnitOfWork = Depends(get_uow)) -> AttachmentService:
@@ -39,13 +43,19 @@ def get_attachment_service(uow: UnitOfWork = Depends(get_uow)) -> AttachmentServ
     return AttachmentService(uow)
 
 
-def get_milestone_service(uow: UnitOfWork = Depends(get_uow)) -> MilestoneService:
-    return MilestoneService(uow=uow)
+def get_milestone_service(
+    uow: UnitOfWork = Depends(get_uow),
+    pegawai_service: PegawaiService = Depends(get_pegawai_service),
+) -> MilestoneService:
+    return MilestoneService(uow=uow, pegawai_service=pegawai_service)
 
 
 def get_category_service(uow: UnitOfWork = Depends(get_uow)):
     return CategoryService(uow=uow)
 
 
-def get_notification_service(uow: UnitOfWork = Depends(get_uow)):
-    return NotificationService(uow)
+def get_notification_service(
+    uow: UnitOfWork = Depends(get_uow),
+    pegawai_service: PegawaiService = Depends(get_pegawai_service),
+):
+    return NotificationService(uow, pegawai_service=pegawai_service)
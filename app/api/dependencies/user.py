@@ -9,13 +9,13 @@ from app.db.models.role_model import Role
 from app.db.repositories.user_repository import InterfaceUserRepository
 from app.db.uow.sqlalchemy import UnitOfWork
 from app.schemas.user import User
-from app.services.pegawai_service import PegawaiService
+from app.services.pegawai_service import PegawaiService, get_pegawai_service
 from app.services.user_service import UserService
 from app.utils import exceptions
 
 
 async def get_user_service(
-    pegawai_service: PegawaiService = Depends(PegawaiService),
+    pegawai_service: PegawaiService = Depends(get_pegawai_service),
     uow: UnitOfWork = Depends(get_uow),
     repo: InterfaceUserRepository = Depends(get_user_repository),
 ) -> UserService:
@@ -26,7 +26,7 @@ async def get_user_service(
 
 async def get_current_user(
     token: str = Depends(validate_token),
-    pegawai_service: PegawaiService = Depends(PegawaiService),
+    pegawai_service: PegawaiService = Depends(get_pegawai_service),
     user_service: UserService = Depends(get_user_service),
 ) -> User:
     """Mendapatkan pengguna saat ini berdasarkan token yang diberikan.
@@ -35,7 +35,7 @@ async def get_current_user(
         token (str, optional): Token yang akan diverifikasi. Defaults to
             Depends(validate_token).
         pegawai_service (PegawaiService, optional): Service pegawai. Defaults to
-            Depends(PegawaiService).
+            Depends(get_pegawai_service).
         user_service (UserService, optional): Service peran pengguna. Defaults to
             Depends(get_user_service).
 
@@ -111,7 +111,10 @@ class _Comment:
         """
         async with self.uow:
             deleted = await self.service.delete_comment(
-                task_id, comment_id, self.user.id, self.user.role == Role.ADMIN
+                task_id=task_id,
+                user_id=self.user.id,
+                comment_id=comment_id,
+                is_admin=self.user.role == Role.ADMIN,
             )
             await self.uow.commit()
 
@@ -4,7 +4,6 @@ from fastapi_utils.cbv import cbv
 from app.api.dependencies.services import (
     get_dashboard_service,
     get_project_service,
-    get_task_service,
 )
 from app.api.dependencies.user import (
     get_user_admin,
@@ -20,7 +19,6 @@ from app.schemas.dashboard import (
 from app.schemas.user import User
 from app.services.dashboard_service import DashboardService
 from app.services.project_service import ProjectService
-from app.services.task_service import TaskService
 from app.services.user_service import UserService
 from app.utils.exceptions import AppErrorResponse
 
@@ -31,7 +29,6 @@ r = router = APIRouter(tags=["dashboard"])
 class _Dashboard:
     dashboard_service: DashboardService = Depends(get_dashboard_service)
     project_service: ProjectService = Depends(get_project_service)
-    task_service: TaskService = Depends(get_task_service)
 
     @r.get(
         "/dashboard/admin",
@@ -96,7 +93,5 @@ class _Dashboard:
     ) -> UserDashboardResponse:
         return await self.dashboard_service.user_dashboard(
             user.id,
-            task_service=self.task_service,
-            project_service=self.project_service,
             limit_tasks=limit_tasks,
         )
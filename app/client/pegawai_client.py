@@ -5,7 +5,7 @@ from typing import Any
 
 import aiohttp
 from fastapi import Request
-from httpx import AsyncClient, Response
+from httpx import AsyncClient, AsyncHTTPTransport, Response, Timeout
 
 from app.core.config.api_pegawai import PegawaiApiUrls
 from app.middleware.request_middleware import request_object
@@ -13,6 +13,13 @@ from app.utils.aiohttp_client import SingletonAiohttp
 
 logger = logging.getLogger(__name__)
 
+# Batas waktu eksplisit ke layanan pegawai agar upstream yang lambat tidak
+# menahan request (dan koneksi pool) terlalu lama.
+PEGAWAI_HTTP_TIMEOUT = Timeout(5.0, connect=2.0)
+# Retry transport httpx hanya mengulang kegagalan saat membuka koneksi, sehingga
+# tetap aman untuk request non-idempoten seperti POST login.
+PEGAWAI_HTTP_RETRIES = 1
+
 
 def _get_bearer_from_ctx(req: Request) -> dict:
     """Ambil header Authorization Bearer dari request aktif.
@@ -25,11 +32,12 @@ def _get_bearer_from_ctx(req: Request) -> dict:
     Returns:
         dict: header Authorization jika tersedia, atau dict kosong jika tidak ada.
     """
-    auth = req.headers.get("authorization") or req.headers.get("Authorization")
+    # Header Starlette case-insensitive, cukup satu lookup
+    auth = req.headers.get("authorization")
     if not auth:
         return {}
 
-    if not str(auth).lower().startswith("bearer "):
+    if auth[:7].lower() != "bearer ":
         auth = f"Bearer {auth}"
 
     return {"Authorization": auth}
@@ -84,7 +92,8 @@ class PegawaiApiClient:
         # httpx.AsyncClient
         httpx_client: AsyncClient | None = getattr(request.state, "client", None)
 
-        start = perf_counter()
+        # Timing hanya diukur bila log debug aktif
+        start = perf_counter() if logger.isEnabledFor(logging.DEBUG) else None
         try:
             if httpx_client is not None:
                 resp = await httpx_client.request(
@@ -94,20 +103,26 @@ class PegawaiApiClient:
                 # dikarenakan di hosting di serverles lifespan/startup
                 # kadang tidak konsisten. Jika request.state.client tidak tersedia,
                 # fallback ke client httpx.AsyncClient temporer.
-                async with AsyncClient(http2=True) as tmp_client:
+                transport = AsyncHTTPTransport(
+                    http2=True, retries=PEGAWAI_HTTP_RETRIES
+                )
+                async with AsyncClient(
+                    transport=transport, timeout=PEGAWAI_HTTP_TIMEOUT
+                ) as tmp_client:
                     resp = await tmp_client.request(
                         method, url, json=json, headers=headers
                     )
                     # Pastikan body sudah dibaca sebelum client ditutup
                     await resp.aread()
 
-            logger.debug(
-                "%s %s -> %s in %.2f ms",
-                method.upper(),
-                url,
-                resp.status_code,
-                (perf_counter() - start) * 1000,
-            )
+            if start is not None:
+                logger.debug(
+                    "%s %s -> %s in %.2f ms",
+                    method.upper(),
+                    url,
+                    resp.status_code,
+                    (perf_counter() - start) * 1000,
+                )
             return resp
         except Exception:
             logger.exception("HTTP %s %s failed", method.upper(), url)
@@ -323,7 +338,8 @@ class PegawaiAiohttpClient:
         headers: dict[str, str] | None = None,
         timeout_sec: float = 20.0,
     ) -> tuple[int, Any | None, str]:
-        start = perf_counter()
+        # Timing hanya diukur bila log debug aktif
+        start = perf_counter() if logger.isEnabledFor(logging.DEBUG) else None
         try:
             # Pakai session singleton yang loop-aware
             session = await SingletonAiohttp.get_aiohttp_client()
@@ -332,7 +348,9 @@ class PegawaiAiohttpClient:
                 url,
                 json=json,
                 headers=headers,
-                timeout=aiohttp.ClientTimeout(total=30),
+                timeout=aiohttp.ClientTimeout(
+                    total=timeout_sec, connect=PEGAWAI_HTTP_TIMEOUT.connect
+                ),
             ) as resp:
                 status = resp.status
                 text = await resp.text()
@@ -372,13 +390,14 @@ class PegawaiAiohttpClient:
             logger.exception("HTTP %s %s failed (aiohttp)", method.upper(), url)
             raise
 
-        logger.debug(
-            "%s %s -> %s in %.2f ms",
-            method.upper(),
-            url,
-            status,
-            (perf_counter() - start) * 1000,
-        )
+        if start is not None:
+            logger.debug(
+                "%s %s -> %s in %.2f ms",
+                method.upper(),
+                url,
+                status,
+                (perf_counter() - start) * 1000,
+            )
         return status, data, text
 
     @staticmethod
@@ -0,0 +1,84 @@
+"""tambah index dashboard
+
+Revision ID: b7d41c2e9a53
+Revises: ddae15ee943b
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d41c2e9a53'
+down_revision: Union[str, None] = 'ddae15ee943b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY tidak boleh berjalan di dalam transaksi
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_project_active_created_at',
+            'project',
+            ['created_at'],
+            unique=False,
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_project_active_status_created_at',
+            'project',
+            ['status', 'created_at'],
+            unique=False,
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_task_assignee_user_id_task_id',
+            'task_assignee',
+            ['user_id', 'task_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_project_member_user_id_role',
+            'project_member',
+            ['user_id', 'role'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_project_member_user_id_role',
+            table_name='project_member',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_task_assignee_user_id_task_id',
+            table_name='task_assignee',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_project_active_status_created_at',
+            table_name='project',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_project_active_created_at',
+            table_name='project',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
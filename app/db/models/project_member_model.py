@@ -1,7 +1,7 @@
 from enum import StrEnum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Enum, ForeignKey, Integer
+from sqlalchemy import Enum, ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -19,6 +19,7 @@ class RoleProject(StrEnum):
 
 class ProjectMember(Base, TimeStampMixin):
     __tablename__ = "project_member"
+    __table_args__ = (Index("ix_project_member_user_id_role", "user_id", "role"),)
 
     project_id: Mapped[int] = mapped_column(
         Integer,
@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import StrEnum
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import DateTime, Enum, Integer, Text
+from sqlalchemy import DateTime, Enum, Index, Integer, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -26,6 +26,20 @@ class StatusProject(StrEnum):
 
 class Project(Base, TimeStampMixin, SoftDeleteMixin):
     __tablename__ = "project"
+    __table_args__ = (
+        # Agregasi dashboard hanya membaca proyek yang belum dihapus
+        Index(
+            "ix_project_active_created_at",
+            "created_at",
+            postgresql_where="deleted_at IS NULL",
+        ),
+        Index(
+            "ix_project_active_status_created_at",
+            "status",
+            "created_at",
+            postgresql_where="deleted_at IS NULL",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     """ID proyek."""
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer
+from sqlalchemy import ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -11,6 +11,9 @@ if TYPE_CHECKING:
 
 class TaskAssignee(Base):
     __tablename__ = "task_assignee"
+    __table_args__ = (
+        Index("ix_task_assignee_user_id_task_id", "user_id", "task_id"),
+    )
 
     task_id: Mapped[int] = mapped_column(
         Integer,
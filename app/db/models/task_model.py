@@ -30,6 +30,13 @@ class StatusTask(StrEnum):
     CANCELLED = "cancelled"
 
 
+OPEN_TASK_STATUSES: tuple[StatusTask, ...] = (
+    StatusTask.PENDING,
+    StatusTask.IN_PROGRESS,
+)
+"""Status tugas yang masih berjalan (belum selesai maupun dibatalkan)."""
+
+
 class PriorityLevel(StrEnum):
     LOW = "low"
     MEDIUM = "medium"
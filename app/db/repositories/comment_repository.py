@@ -1,11 +1,11 @@
 from typing import Protocol, Sequence, runtime_checkable
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.db.models.comment_model import Comment
-from app.db.models.project_model import Project, StatusProject
+from app.db.models.project_member_model import ProjectMember, RoleProject
 from app.db.models.task_model import Task
 
 
@@ -42,8 +42,8 @@ class InterfaceCommentRepository(Protocol):
             task_id: ID task yang komentarnya ingin diambil.
 
         Returns:
-            Sequence[Comment]: Daftar komentar untuk task terkait, urutan sesuai
-                kebijakan implementasi.
+            Sequence[Comment]: Daftar komentar untuk task terkait, diurutkan dari
+                yang paling lama berdasarkan waktu pembuatan.
         """
         ...
 
@@ -73,28 +73,33 @@ class InterfaceCommentRepository(Protocol):
         """
         ...
 
-    async def delete_by_id_in_task(self, *, comment_id: int, task_id: int) -> bool:
+    async def get_with_ownership(
+        self, *, comment_id: int, task_id: int, user_id: int
+    ) -> "tuple[Comment | None, bool]":
         """
-        Menghapus sebuah komentar berdasarkan ID komentar dan ID task-nya.
+        Mengambil komentar sekaligus status owner proyek user dalam satu query.
 
         Args:
-            comment_id: ID komentar yang akan dihapus.
+            comment_id: ID komentar yang dicari.
             task_id: ID task pemilik komentar tersebut (untuk memastikan scoping).
+            user_id: ID pengguna yang dicek sebagai owner proyek task.
 
         Returns:
-            bool: True jika ada baris yang terhapus, False jika tidak ada.
+            tuple[Comment | None, bool]: Komentar (None jika tidak ada) dan True
+                jika user adalah owner proyek tempat task berada.
         """
         ...
 
-    async def is_task_in_active_project(self, *, task_id: int) -> bool:
+    async def delete_by_id_in_task(self, *, comment_id: int, task_id: int) -> bool:
         """
-        Mengecek apakah task berada pada project yang masih aktif dan tidak dihapus.
+        Menghapus sebuah komentar berdasarkan ID komentar dan ID task-nya.
 
         Args:
-            task_id: ID task yang akan dicek.
+            comment_id: ID komentar yang akan dihapus.
+            task_id: ID task pemilik komentar tersebut (untuk memastikan scoping).
 
         Returns:
-            bool: True jika project aktif, False jika tidak.
+            bool: True jika ada baris yang terhapus, False jika tidak ada.
         """
         ...
 
@@ -117,6 +122,7 @@ class CommentSQLAlchemyRepository(InterfaceCommentRepository):
             select(Comment)
             .where(Comment.task_id == task_id)
             .options(selectinload(Comment.attachments))
+            .order_by(Comment.created_at)
         )
         return result.scalars().all()
 
@@ -139,28 +145,36 @@ class CommentSQLAlchemyRepository(InterfaceCommentRepository):
         )
         return result.scalar_one_or_none()
 
-    async def delete_by_id_in_task(self, *, comment_id: int, task_id: int) -> bool:
+    async def get_with_ownership(
+        self, *, comment_id: int, task_id: int, user_id: int
+    ) -> tuple[Comment | None, bool]:
+        is_owner = (
+            exists()
+            .where(
+                Task.id == Comment.task_id,
+                ProjectMember.project_id == Task.project_id,
+                ProjectMember.user_id == user_id,
+                ProjectMember.role == RoleProject.OWNER,
+            )
+            .correlate(Comment)
+        )
         result = await self.session.execute(
-            delete(Comment).where(
+            select(Comment, is_owner).where(
                 Comment.id == comment_id,
                 Comment.task_id == task_id,
             )
         )
-        await self.session.flush()
-        return (result.rowcount or 0) > 0
+        row = result.one_or_none()
+        if row is None:
+            return None, False
+        return row[0], bool(row[1])
 
-    async def is_task_in_active_project(self, *, task_id: int) -> bool:
+    async def delete_by_id_in_task(self, *, comment_id: int, task_id: int) -> bool:
         result = await self.session.execute(
-            select(1)
-            .select_from(Task)
-            .join(Project, Task.project_id == Project.id)
-            .where(
-                # Pastikan di task sama
-                Task.id == task_id,
-                # Task berada di project yang aktif
-                Project.status == StatusProject.ACTIVE,
-                # Task tidak dihapus
+            delete(Comment).where(
+                Comment.id == comment_id,
+                Comment.task_id == task_id,
             )
-            .limit(1)
         )
-        return result.scalar_one_or_none() is not None
+        await self.session.flush()
+        return (result.rowcount or 0) > 0
@@ -3,31 +3,27 @@ from __future__ import annotations
 from datetime import date
 from typing import Protocol
 
-from sqlalchemy import case, func, select
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    case,
+    cast,
+    func,
+    literal_column,
+    null,
+    select,
+    true,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.project_member_model import ProjectMember, RoleProject
 from app.db.models.project_model import Project, StatusProject
 from app.db.models.task_assigne_model import TaskAssignee
-from app.db.models.task_model import StatusTask, Task
+from app.db.models.task_model import OPEN_TASK_STATUSES, StatusTask, Task
 
 
 class InterfaceDashboardReadRepository(Protocol):
-    async def get_pm_project_status_summary(
-        self, *, user_id: int, start_of_this_month: date
-    ) -> dict:
-        """Mendapatkan ringkasan status proyek untuk PM.
-
-        Args:
-            start_of_this_month (date): Tanggal awal bulan ini.
-
-        Returns:
-            dict: Ringkasan status proyek. terdiri dari total_project (Jumlah proyek)
-            , active_projects (Jumlah proyek aktif), completed_projects (Jumlah
-            proyek selesai), dan new_this_month (Jumlah proyek baru bulan ini).
-        """
-        ...
-
     async def get_project_status_summary(self, *, start_of_this_month: date) -> dict:
         """Mendapatkan ringkasan status semua project.
 
@@ -41,18 +37,22 @@ class InterfaceDashboardReadRepository(Protocol):
         """
         ...
 
-    async def get_pm_yearly_project_summary(
-        self, *, user_id: int, one_year_ago: date
-    ) -> list[dict]:
-        """Mendapatkan ringkasan tahunan untuk PM.
+    async def get_pm_dashboard_summary(
+        self, *, user_id: int, start_of_this_month: date, one_year_ago: date
+    ) -> tuple[dict, list[dict]]:
+        """Mendapatkan ringkasan status proyek dan ringkasan tahunan PM dalam satu
+        query.
 
         Args:
+            user_id (int): ID pengguna.
+            start_of_this_month (date): Tanggal awal bulan ini.
             one_year_ago (date): Tanggal satu tahun yang lalu.
 
         Returns:
-            list[dict]: Daftar ringkasan tahunan. terdiri dari bulan (month), jumlah
-            proyek yang dibuat (created_count), diaktifkan (actived_count), dan
-            diselesaikan (completed_count).
+            tuple[dict, list[dict]]: Ringkasan status proyek, terdiri dari
+                total_project, active_projects, completed_projects, dan
+                new_this_month; serta daftar ringkasan tahunan per bulan, terdiri
+                dari month, created_count, actived_count, dan completed_count.
         """
         ...
 
@@ -72,6 +72,18 @@ class InterfaceDashboardReadRepository(Protocol):
         """
         ...
 
+    async def get_user_dashboard_stats(self, user_id: int) -> dict[str, int]:
+        """Mendapatkan statistik proyek dan tugas pengguna dalam satu query.
+
+        Args:
+            user_id (int): ID pengguna.
+
+        Returns:
+            dict[str, int]: total_project, project_active, project_completed,
+                total_task, task_in_progress, task_completed, dan task_cancelled.
+        """
+        ...
+
     async def list_user_upcoming_tasks(self, user_id: int, limit: int) -> list[Task]:
         """List tugas yang akan datang untuk pengguna tertentu.
 
@@ -89,54 +101,18 @@ class DashboardSQLAlchemyReadRepository(InterfaceDashboardReadRepository):
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    async def get_pm_project_status_summary(
-        self, *, user_id: int, start_of_this_month: date
-    ) -> dict:
-        stmt = (
-            select(
-                func.count(Project.id).label("total_project"),
-                func.sum(
-                    case((Project.status == StatusProject.ACTIVE, 1), else_=0)
-                ).label("active_projects"),
-                func.sum(
-                    case((Project.status == StatusProject.COMPLETED, 1), else_=0)
-                ).label("completed_projects"),
-                func.sum(
-                    case((Project.created_at >= start_of_this_month, 1), else_=0)
-                ).label("new_this_month"),
-            )
-            .join(ProjectMember, ProjectMember.project_id == Project.id)
-            .where(
-                # Project yang tidak dihapus
-                Project.deleted_at.is_(None),
-                # Filter bedasarkan owner
-                ProjectMember.user_id == user_id,
-                # Filter berdasarkan role
-                # ProjectMember.role == RoleProject.OWNER,
-            )
-        )
-
-        res = await self.session.execute(stmt)
-        row = res.fetchone()
-        return {
-            "total_project": (row.total_project or 0) if row else 0,
-            "active_projects": (row.active_projects or 0) if row else 0,
-            "completed_projects": (row.completed_projects or 0) if row else 0,
-            "new_this_month": (row.new_this_month or 0) if row else 0,
-        }
-
     async def get_project_status_summary(self, *, start_of_this_month: date) -> dict:
         stmt = select(
             func.count(Project.id).label("total_project"),
-            func.sum(
-                case((Project.status == StatusProject.ACTIVE, 1), else_=0)
-            ).label("active_projects"),
-            func.sum(
-                case((Project.status == StatusProject.COMPLETED, 1), else_=0)
-            ).label("completed_projects"),
-            func.sum(
-                case((Project.created_at >= start_of_this_month, 1), else_=0)
-            ).label("new_this_month"),
+            func.count()
+            .filter(Project.status == StatusProject.ACTIVE)
+            .label("active_projects"),
+            func.count()
+            .filter(Project.status == StatusProject.COMPLETED)
+            .label("completed_projects"),
+            func.count()
+            .filter(Project.created_at >= start_of_this_month)
+            .label("new_this_month"),
         ).where(
             # Project yang tidak dihapus
             Project.deleted_at.is_(None),
@@ -151,49 +127,83 @@ class DashboardSQLAlchemyReadRepository(InterfaceDashboardReadRepository):
             "new_this_month": (row.new_this_month or 0) if row else 0,
         }
 
-    async def get_pm_yearly_project_summary(
-        self, *, user_id: int, one_year_ago: date
-    ) -> list[dict]:
-        q = (
+    async def get_pm_dashboard_summary(
+        self, *, user_id: int, start_of_this_month: date, one_year_ago: date
+    ) -> tuple[dict, list[dict]]:
+        # Kedua bagian UNION memakai nama kolom yang sama; kolom "kind"
+        # membedakan baris ringkasan dari baris per bulan.
+        summary_q = (
+            select(
+                literal_column("'summary'").label("kind"),
+                cast(null(), DateTime(True)).label("month"),
+                func.count(Project.id).label("total_count"),
+                func.count()
+                .filter(Project.status == StatusProject.ACTIVE)
+                .label("active_count"),
+                func.count()
+                .filter(Project.status == StatusProject.COMPLETED)
+                .label("completed_count"),
+                func.count()
+                .filter(Project.created_at >= start_of_this_month)
+                .label("new_this_month"),
+            )
+            .join(ProjectMember, ProjectMember.project_id == Project.id)
+            .where(
+                Project.deleted_at.is_(None),
+                ProjectMember.user_id == user_id,
+            )
+        )
+        month = func.date_trunc("month", Project.created_at)
+        yearly_q = (
             select(
-                # bulan proyek dibuat
-                func.date_trunc("month", Project.created_at).label("month"),
-                # jumlah project yang dibuat dalam bulan tersebut
-                func.sum(
-                    case((Project.created_at >= one_year_ago, 1), else_=0)
-                ).label("created_count"),
-                # jumlah project ACTIVE
-                func.sum(
-                    case((Project.status == StatusProject.ACTIVE, 1), else_=0)
-                ).label("actived_count"),
-                # jumlah project COMPLETED
-                func.sum(
-                    case((Project.status == StatusProject.COMPLETED, 1), else_=0)
-                ).label("completed_count"),
+                literal_column("'month'").label("kind"),
+                month.label("month"),
+                func.count(Project.id).label("total_count"),
+                func.count()
+                .filter(Project.status == StatusProject.ACTIVE)
+                .label("active_count"),
+                func.count()
+                .filter(Project.status == StatusProject.COMPLETED)
+                .label("completed_count"),
+                # hanya relevan untuk baris ringkasan
+                cast(null(), Integer).label("new_this_month"),
             )
             .join(ProjectMember, ProjectMember.project_id == Project.id)
             .where(
-                # proyek yang dibuat dalam satu tahun terakhir
                 Project.created_at >= one_year_ago,
-                # proyek yang bukan di hapus
                 Project.deleted_at.is_(None),
-                # Filter bedasarkan owner
                 ProjectMember.user_id == user_id,
-                # Filter berdasarkan role
                 ProjectMember.role == RoleProject.OWNER,
             )
-            .group_by("month")
+            .group_by(month)
         )
-        res = await self.session.execute(q)
-        return [
-            {
-                "month": row.month,
-                "created_count": row.created_count,
-                "actived_count": row.actived_count,
-                "completed_count": row.completed_count,
-            }
-            for row in res.fetchall()
-        ]
+
+        res = await self.session.execute(union_all(summary_q, yearly_q))
+        summary = {
+            "total_project": 0,
+            "active_projects": 0,
+            "completed_projects": 0,
+            "new_this_month": 0,
+        }
+        yearly: list[dict] = []
+        for row in res.all():
+            if row.kind == "summary":
+                summary = {
+                    "total_project": row.total_count or 0,
+                    "active_projects": row.active_count or 0,
+                    "completed_projects": row.completed_count or 0,
+                    "new_this_month": row.new_this_month or 0,
+                }
+            else:
+                yearly.append(
+                    {
+                        "month": row.month,
+                        "created_count": row.total_count,
+                        "actived_count": row.active_count,
+                        "completed_count": row.completed_count,
+                    }
+                )
+        return summary, yearly
 
     async def list_pm_upcoming_project_deadlines(
         self, *, user_id: int, skip: int, limit: int
@@ -201,25 +211,16 @@ class DashboardSQLAlchemyReadRepository(InterfaceDashboardReadRepository):
         q = (
             select(
                 Project,
-                # Hitung jumlah task per status berdasarkan corelasi subquery
-                (
-                    select(func.count())
-                    .where(
-                        Task.project_id == Project.id,
-                        Task.status != StatusTask.PENDING,
-                    )
-                    .scalar_subquery()
-                ).label("task_count"),
-                (
-                    select(func.count())
-                    .where(
-                        Task.project_id == Project.id,
-                        Task.status == StatusTask.IN_PROGRESS,
-                    )
-                    .scalar_subquery()
-                ).label("task_in_progress"),
+                # Hitung jumlah task per status dalam satu agregasi LEFT JOIN
+                func.count(Task.id)
+                .filter(Task.status != StatusTask.PENDING)
+                .label("task_count"),
+                func.count(Task.id)
+                .filter(Task.status == StatusTask.IN_PROGRESS)
+                .label("task_in_progress"),
             )
             .join(ProjectMember, ProjectMember.project_id == Project.id)
+            .outerjoin(Task, Task.project_id == Project.id)
             .where(
                 # Project yang tidak dihapus
                 Project.deleted_at.is_(None),
@@ -232,6 +233,7 @@ class DashboardSQLAlchemyReadRepository(InterfaceDashboardReadRepository):
                 # Filter berdasarkan role
                 ProjectMember.role == RoleProject.OWNER,
             )
+            .group_by(Project.id)
             .order_by(Project.end_date.asc())
             .offset(skip)
             .limit(limit)
@@ -243,6 +245,59 @@ class DashboardSQLAlchemyReadRepository(InterfaceDashboardReadRepository):
             for row in rows
         ]
 
+    async def get_user_dashboard_stats(self, user_id: int) -> dict[str, int]:
+        counted_statuses = [StatusProject.ACTIVE, StatusProject.COMPLETED]
+        user_projects = (
+            select(
+                func.count().label("total_project"),
+                func.count()
+                .filter(Project.status == StatusProject.ACTIVE)
+                .label("project_active"),
+                func.count()
+                .filter(Project.status == StatusProject.COMPLETED)
+                .label("project_completed"),
+            )
+            .join(ProjectMember, ProjectMember.project_id == Project.id)
+            .where(
+                ProjectMember.user_id == user_id,
+                Project.status.in_(counted_statuses),
+                Project.deleted_at.is_(None),
+            )
+            .cte("user_projects")
+        )
+        user_tasks = (
+            select(
+                func.count().label("total_task"),
+                func.count()
+                .filter(Task.status == StatusTask.IN_PROGRESS)
+                .label("task_in_progress"),
+                func.count()
+                .filter(Task.status == StatusTask.COMPLETED)
+                .label("task_completed"),
+                func.count()
+                .filter(Task.status == StatusTask.CANCELLED)
+                .label("task_cancelled"),
+            )
+            .join(TaskAssignee, TaskAssignee.task_id == Task.id)
+            .join(Project, Project.id == Task.project_id)
+            .where(
+                TaskAssignee.user_id == user_id,
+                Task.status.not_in([StatusTask.PENDING]),
+                Project.status.in_(counted_statuses),
+                Project.deleted_at.is_(None),
+            )
+            .cte("user_tasks")
+        )
+
+        # Masing-masing CTE menghasilkan tepat satu baris agregat
+        res = await self.session.execute(
+            select(user_projects, user_tasks).join_from(
+                user_projects, user_tasks, true()
+            )
+        )
+        row = res.mappings().one()
+        return {key: int(value or 0) for key, value in row.items()}
+
     async def list_user_upcoming_tasks(self, user_id: int, limit: int) -> list[Task]:
         q = (
             select(Task)
@@ -258,8 +313,8 @@ class DashboardSQLAlchemyReadRepository(InterfaceDashboardReadRepository):
                 Project.status == StatusProject.ACTIVE,
                 # task yang memiliki due date
                 Task.due_date.is_not(None),
-                # task yang tidak di selesaikan
-                Task.status != StatusTask.COMPLETED,
+                # task yang masih berjalan
+                Task.status.in_(OPEN_TASK_STATUSES),
             )
             .order_by(
                 case((Task.due_date < func.now(), 0), else_=1),
@@ -1,9 +1,11 @@
 from typing import Any, Callable, Optional, Protocol, runtime_checkable
 
-from sqlalchemy import Select, select
+from sqlalchemy import Select, delete, exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.milestone_model import Milestone
+from app.db.models.project_member_model import ProjectMember, RoleProject
+from app.db.models.task_model import Task
 
 CustomQuery = Callable[[Select], Select]
 
@@ -23,6 +25,22 @@ class InterfaceMilestoneRepository(Protocol):
         """
         ...
 
+    async def get_with_ownership(
+        self, *, milestone_id: int, user_id: int
+    ) -> tuple[Milestone | None, bool, bool]:
+        """Mendapatkan milestone sekaligus status owner user dan keberadaan task
+        dalam satu query.
+
+        Args:
+            milestone_id (int): ID milestone.
+            user_id (int): ID user yang diperiksa kepemilikannya.
+
+        Returns:
+            tuple[Milestone | None, bool, bool]: (milestone, is_owner, has_tasks).
+                Milestone bernilai None jika tidak ditemukan.
+        """
+        ...
+
     async def create_milestone(self, *, payload: dict[str, Any]) -> Milestone:
         """Membuat milestone baru
 
@@ -109,6 +127,31 @@ class MilestoneSQLAlchemyRepository(InterfaceMilestoneRepository):
     ) -> Milestone | None:
         return await self.session.get(Milestone, milestone_id, options=options)
 
+    async def get_with_ownership(
+        self, *, milestone_id: int, user_id: int
+    ) -> tuple[Milestone | None, bool, bool]:
+        is_owner = (
+            exists()
+            .where(
+                ProjectMember.project_id == Milestone.project_id,
+                ProjectMember.user_id == user_id,
+                ProjectMember.role == RoleProject.OWNER,
+            )
+            .correlate(Milestone)
+        )
+        has_tasks = (
+            exists().where(Task.milestone_id == Milestone.id).correlate(Milestone)
+        )
+        result = await self.session.execute(
+            select(Milestone, is_owner, has_tasks).where(
+                Milestone.id == milestone_id
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None, False, False
+        return row[0], bool(row[1]), bool(row[2])
+
     async def create_milestone(self, *, payload: dict[str, Any]) -> Milestone:
         milestone = Milestone(**payload)
         self.session.add(milestone)
@@ -125,19 +168,12 @@ class MilestoneSQLAlchemyRepository(InterfaceMilestoneRepository):
             await self.session.delete(milestone)
             return True
 
-        stmt = (
-            select(Milestone)
-            .where(
-                Milestone.id == milestone_id,
-            )
-            .limit(1)
+        # DELETE langsung tanpa memuat Milestone.tasks untuk cascade ORM;
+        # pemanggil wajib memastikan milestone sudah tidak memiliki task.
+        result = await self.session.execute(
+            delete(Milestone).where(Milestone.id == milestone_id)
         )
-        res = await self.session.execute(stmt)
-        milestone = res.scalar_one_or_none()
-        if milestone:
-            await self.session.delete(milestone)
-            return True
-        return False
+        return (result.rowcount or 0) > 0
 
     async def list_by_project(
         self,
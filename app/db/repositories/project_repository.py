@@ -2,7 +2,8 @@ from abc import abstractmethod
 from datetime import date
 from typing import Any, Sequence
 
-from sqlalchemy import Row, case, exists, func, select
+from sqlalchemy import Row, case, delete, exists, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
 
 from app.db.models.project_member_model import ProjectMember, RoleProject
@@ -16,6 +17,11 @@ from app.db.repositories.generic_repository import (
 from app.schemas.project import ProjectCreate, ProjectUpdate
 from app.utils.pagination import paginate
 
+# Memo flag keanggotaan disimpan di ``session.info`` sehingga hanya hidup
+# selama satu session (satu request/UoW).
+# key: (user_id, project_id, required_role)
+_MEMBERSHIP_MEMO = "project_membership_flags"
+
 
 class InterfaceProjectRepository(
     InterfaceRepository[Project, ProjectCreate, ProjectUpdate]
@@ -39,7 +45,7 @@ class InterfaceProjectRepository(
     @abstractmethod
     async def add_project_member(
         self, project_id: int, user_id: int, role: RoleProject
-    ) -> ProjectMember:
+    ) -> ProjectMember | None:
         """Menambahkan anggota baru ke proyek.
 
         Args:
@@ -48,16 +54,20 @@ class InterfaceProjectRepository(
             role (RoleProject): Peran anggota dalam proyek.
 
         Returns:
-            ProjectMember: Anggota proyek yang baru ditambahkan.
+            ProjectMember | None: Anggota proyek yang baru ditambahkan, atau
+                None jika pengguna sudah menjadi anggota proyek.
         """
 
     @abstractmethod
-    async def remove_project_member(self, project_id: int, user_id: int) -> None:
+    async def remove_project_member(self, project_id: int, user_id: int) -> bool:
         """Menghapus anggota dari proyek.
 
         Args:
             project_id (int): ID proyek.
             user_id (int): ID pengguna.
+
+        Returns:
+            bool: True jika anggota ditemukan dan dihapus.
         """
 
     @abstractmethod
@@ -305,6 +315,21 @@ class ProjectSQLAlchemyRepository(
 
     model = Project
 
+    @property
+    def _membership_flags(
+        self,
+    ) -> dict[tuple[int, int, RoleProject | None], tuple[bool, bool]]:
+        """Memo flag keanggotaan milik session aktif.
+
+        Hanya dikosongkan oleh method tulis repository ini (anggota maupun
+        proyek). Perubahan keanggotaan lewat repository/statement lain pada
+        session yang sama, atau dari session lain, tidak terdeteksi.
+        """
+        return self.session.info.setdefault(_MEMBERSHIP_MEMO, {})
+
+    def _clear_membership_flags(self) -> None:
+        self.session.info.pop(_MEMBERSHIP_MEMO, None)
+
     async def get_member_by_ids(
         self, project_id: int, member_id: int
     ) -> ProjectMember | None:
@@ -312,22 +337,35 @@ class ProjectSQLAlchemyRepository(
 
     async def add_project_member(
         self, project_id: int, user_id: int, role: RoleProject
-    ) -> ProjectMember:
-        member = ProjectMember(project_id=project_id, user_id=user_id, role=role)
-        self.session.add(member)
-        await self.session.flush()
-        await self.session.refresh(member)
+    ) -> ProjectMember | None:
+        # INSERT ... ON CONFLICT DO NOTHING menggantikan cek duplikat terpisah;
+        # RETURNING kosong berarti anggota sudah ada.
+        stmt = (
+            insert(ProjectMember)
+            .values(project_id=project_id, user_id=user_id, role=role)
+            .on_conflict_do_nothing(index_elements=["project_id", "user_id"])
+            .returning(ProjectMember)
+        )
+        member = (await self.session.scalars(stmt)).first()
+        if member is not None:
+            self._clear_membership_flags()
         return member
 
-    async def remove_project_member(self, project_id: int, user_id: int) -> None:
-        member = await self.get_member_by_ids(project_id, user_id)
-        if member:
-            await self.session.delete(member)
-            await self.session.flush()
+    async def remove_project_member(self, project_id: int, user_id: int) -> bool:
+        # satu DELETE langsung, tanpa memuat baris ke identity map terlebih dahulu
+        result = await self.session.execute(
+            delete(ProjectMember).where(
+                ProjectMember.project_id == project_id,
+                ProjectMember.user_id == user_id,
+            )
+        )
+        self._clear_membership_flags()
+        return (result.rowcount or 0) > 0
 
     async def update_project_member_role(
         self, member: ProjectMember, project_id: int, role: RoleProject
     ) -> ProjectMember:
+        self._clear_membership_flags()
         member.role = role
         await self.session.flush()
         await self.session.refresh(member)
@@ -588,15 +626,12 @@ class ProjectSQLAlchemyRepository(
         return res.scalars().first()
 
     async def is_user_owner_of_project(self, project_id: int, user_id: int) -> bool:
-        stmt = select(
-            exists().where(
-                ProjectMember.project_id == project_id,
-                ProjectMember.user_id == user_id,
-                ProjectMember.role == RoleProject.OWNER,
-            )
+        # Flag "allowed" dengan role OWNER adalah pengecekan yang sama, sehingga
+        # hasilnya ikut tersimpan di memo
+        _, is_owner = await self.get_project_membership_flags(
+            user_id=user_id, project_id=project_id, required_role=RoleProject.OWNER
         )
-        result = await self.session.execute(stmt)
-        return result.scalar_one()
+        return is_owner
 
     async def ensure_member_in_project(
         self,
@@ -624,6 +659,11 @@ class ProjectSQLAlchemyRepository(
         project_id: int,
         required_role: RoleProject | None = None,
     ) -> tuple[bool, bool]:
+        key = (user_id, project_id, required_role)
+        cached = self._membership_flags.get(key)
+        if cached is not None:
+            return cached
+
         role_condition = (
             [ProjectMember.role == required_role]
             if required_role is not None
@@ -647,7 +687,23 @@ class ProjectSQLAlchemyRepository(
         )
         res = await self.session.execute(stmt)
         row = res.one()
-        return bool(row.project_exists), bool(row.allowed)
+        flags = bool(row.project_exists), bool(row.allowed)
+        self._membership_flags[key] = flags
+        return flags
+
+    async def on_created(self, instance: Project) -> None:
+        self._clear_membership_flags()
+
+    async def on_updated(
+        self, instance: Project, change: dict[str, Any], **kwargs
+    ) -> None:
+        self._clear_membership_flags()
+
+    async def on_soft_deleted(self, instance: Project, **kwargs) -> None:
+        self._clear_membership_flags()
+
+    async def on_hard_deleted(self, instance: Project, **kwargs) -> None:
+        self._clear_membership_flags()
 
     async def list_project_members(
         self, project_id: int, role: RoleProject | None = None
@@ -688,6 +744,6 @@ class ProjectSQLAlchemyRepository(
                 )
             )
 
-        q.where(*condition)
+        q = q.where(*condition)
         res = await self.session.execute(q)
         return res.scalars().first()
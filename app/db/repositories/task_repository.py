@@ -3,11 +3,11 @@ from __future__ import annotations
 from datetime import date
 from typing import Any, Callable, Optional, Protocol, Sequence, runtime_checkable
 
-from sqlalchemy import Select, case, delete, func, select
+from sqlalchemy import Select, case, delete, exists, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.db.models.project_member_model import ProjectMember, RoleProject
+from app.db.models.project_member_model import ProjectMember
 from app.db.models.project_model import Project, StatusProject
 from app.db.models.task_assigne_model import TaskAssignee
 from app.db.models.task_model import PriorityLevel, StatusTask, Task
@@ -171,29 +171,17 @@ class InterfaceTaskRepository(Protocol):
         """
         ...
 
-    async def is_task_in_active_project(self, task_id: int) -> bool:
-        """
-        Mengecek apakah task berada pada project yang masih aktif dan tidak dihapus.
-
-        Args:
-            task_id: ID task yang akan dicek.
-
-        Returns:
-            bool: True jika project aktif, False jika tidak.
-        """
-        ...
-
-    async def is_user_owner_of_tasks_project(
-        self, user_id: int, task_id: int
-    ) -> bool:
-        """Mengecek apakah user adalah pemilik proyek dari task yang diberikan.
+    async def get_comment_preflight(
+        self, task_id: int, user_id: int
+    ) -> tuple[bool, bool]:
+        """Mengecek status proyek aktif dan keanggotaan user dalam satu query.
 
         Args:
-            user_id (int): ID user yang akan dicek.
             task_id (int): ID task yang akan dicek.
+            user_id (int): ID user yang akan dicek keanggotaannya.
 
         Returns:
-            bool: True jika user adalah pemilik proyek, False jika tidak.
+            tuple[bool, bool]: (proyek task aktif, user anggota proyek task).
         """
         ...
 
@@ -480,40 +468,27 @@ class TaskSQLAlchemyRepository(InterfaceTaskRepository):
         )
         return result.scalar_one_or_none() is not None
 
-    async def is_task_in_active_project(self, task_id: int) -> bool:
-        result = await self.session.execute(
-            select(1)
-            .select_from(Task)
-            .join(Project, Task.project_id == Project.id)
+    async def get_comment_preflight(
+        self, task_id: int, user_id: int
+    ) -> tuple[bool, bool]:
+        is_member = (
+            exists()
             .where(
-                # Pastikan di task sama
-                Task.id == task_id,
-                # Task berada di project yang aktif
-                Project.status == StatusProject.ACTIVE,
+                ProjectMember.project_id == Project.id,
+                ProjectMember.user_id == user_id,
             )
-            .limit(1)
+            .correlate(Project)
         )
-        return result.scalar_one_or_none() is not None
-
-    async def is_user_owner_of_tasks_project(
-        self, user_id: int, task_id: int
-    ) -> bool:
         result = await self.session.execute(
-            select(1)
+            select(Project.status == StatusProject.ACTIVE, is_member)
             .select_from(Task)
             .join(Project, Task.project_id == Project.id)
-            .join(ProjectMember, ProjectMember.project_id == Project.id)
-            .where(
-                # memastikan id task sama
-                Task.id == task_id,
-                # memastikan user adalah anggota project
-                ProjectMember.user_id == user_id,
-                # memastikan user adalah owner project
-                ProjectMember.role == RoleProject.OWNER,
-            )
-            .limit(1)
+            .where(Task.id == task_id)
         )
-        return result.scalar_one_or_none() is not None
+        row = result.one_or_none()
+        if row is None:
+            return False, False
+        return bool(row[0]), bool(row[1])
 
     async def get_project_member_user_ids_by_task(
         self, task_id: int
@@ -4,9 +4,10 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from httpx import AsyncClient
+from httpx import AsyncClient, AsyncHTTPTransport, Limits
 
 from app.api import api
+from app.client.pegawai_client import PEGAWAI_HTTP_RETRIES, PEGAWAI_HTTP_TIMEOUT
 from app.core.config import settings
 from app.core.config.logging import configure_logging
 from app.core.domain.subscribers import register_event_handlers
@@ -37,8 +38,18 @@ async def lifespan(app: FastAPI):
 
     await aiohttp_client.on_start_up()
 
-    # inisialisasi httpx.AsyncClient untuk digunakan di seluruh aplikasi
-    async with AsyncClient(http2=True) as client:
+    # inisialisasi httpx.AsyncClient untuk digunakan di seluruh aplikasi.
+    # keep-alive diperpanjang agar koneksi ke layanan pegawai tetap hangat
+    # di antara request
+    limits = Limits(
+        max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0
+    )
+    transport = AsyncHTTPTransport(
+        http2=True, limits=limits, retries=PEGAWAI_HTTP_RETRIES
+    )
+    async with AsyncClient(
+        transport=transport, timeout=PEGAWAI_HTTP_TIMEOUT
+    ) as client:
         yield {"client": client}
 
     await aiohttp_client.on_shutdown()
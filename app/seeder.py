@@ -26,7 +26,7 @@ from app.schemas.task import TaskCreate
 from app.schemas.user import User
 from app.services.category_service import CategoryService
 from app.services.milestone_service import MilestoneService
-from app.services.pegawai_service import PegawaiService
+from app.services.pegawai_service import get_pegawai_service
 from app.services.project_service import ProjectService
 from app.services.task_service import TaskService
 from app.services.user_service import UserService
@@ -75,7 +75,7 @@ class Seeder:
         self.pm_user_id = pm_user_id
 
         self.uow = UnitOfWork(session=self.session)
-        self.pegawai_service = PegawaiService()
+        self.pegawai_service = get_pegawai_service()
         self.user_service = UserService(
             pegawai_service=self.pegawai_service,
             uow=self.uow,
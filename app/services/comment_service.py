@@ -1,14 +1,18 @@
+import heapq
 import logging
-from typing import Mapping, Optional, cast
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional, cast
 
 from app.core.domain.event import EventType
 from app.db.models.audit_model import AuditLog
 from app.db.models.comment_model import Comment
 from app.db.uow.sqlalchemy import UnitOfWork
+from app.schemas.attachment import AttachmentRead
 from app.schemas.audit import (
     TaskActionType,
     TaskAssignAddedAuditSchama,
     TaskAssignRemovedAuditSchama,
+    TaskAuditListSchema,
     TaskAuditSchema,
     TaskStatusChangeAuditSchema,
     TaskTitleChangeAuditSchema,
@@ -20,15 +24,79 @@ from app.schemas.comment import (
     CommentWithCommentRead,
 )
 from app.schemas.user import UserBase
-from app.services.pegawai_service import PegawaiService
+from app.services.pegawai_service import PegawaiService, get_pegawai_service
 from app.utils import exceptions
 
 logger = logging.getLogger(__name__)
 
 
+def _status_details(d: Mapping) -> TaskStatusChangeAuditSchema:
+    return TaskStatusChangeAuditSchema(
+        old_status=str(d.get("old_status", "")),
+        new_status=str(d.get("new_status", "")),
+    )
+
+
+def _title_details(d: Mapping) -> TaskTitleChangeAuditSchema:
+    return TaskTitleChangeAuditSchema(
+        before=str(d.get("before", "")),
+        after=str(d.get("after", "")),
+    )
+
+
+def _assign_added_details(d: Mapping) -> TaskAssignAddedAuditSchama:
+    return TaskAssignAddedAuditSchama(
+        assignee_id=str(d.get("assignee_id", "")),
+        assignee_name=str(d.get("assignee_name", "")),
+    )
+
+
+def _assign_removed_details(d: Mapping) -> TaskAssignRemovedAuditSchama:
+    return TaskAssignRemovedAuditSchama(
+        assignee_id=str(d.get("assignee_id", "")),
+        assignee_name=str(d.get("assignee_name", "")),
+    )
+
+
+# Event audit task yang ditampilkan bersama komentar
+_AUDIT_EVENT_TYPES: tuple[str, ...] = (
+    EventType.TASK_STATUS_CHANGED.value,
+    EventType.TASK_TITLE_CHANGED.value,
+    EventType.TASK_ASSIGNED_ADDED.value,
+    EventType.TASK_ASSIGNED_REMOVED.value,
+)
+
+# Pengganti details NULL; hanya dibaca sehingga aman dipakai bersama
+_EMPTY_DETAILS: Mapping = MappingProxyType({})
+
+# Builder detail audit berdasarkan nilai mentah action_type di database
+_AUDIT_BUILDERS: dict[str, Callable[[Mapping], TaskAuditListSchema]] = {
+    EventType.TASK_STATUS_CHANGED.value: _status_details,
+    EventType.TASK_TITLE_CHANGED.value: _title_details,
+    EventType.TASK_ASSIGNED_ADDED.value: _assign_added_details,
+    EventType.TASK_ASSIGNED_REMOVED.value: _assign_removed_details,
+}
+
+
 class CommentService:
-    def __init__(self, uow: UnitOfWork):
+    def __init__(
+        self, uow: UnitOfWork, pegawai_service: PegawaiService | None = None
+    ):
         self.uow = uow
+        self.pegawai_service = pegawai_service or get_pegawai_service()
+        self._membership_cache: dict[tuple[int, int], bool] = {}
+
+    async def _is_member(self, task_id: int, user_id: int) -> bool:
+        """Cek keanggotaan user pada proyek task, di-memo per instance service
+        (satu request) agar tidak query berulang untuk pasangan yang sama."""
+        key = (task_id, user_id)
+        cached = self._membership_cache.get(key)
+        if cached is None:
+            cached = await self.uow.task_repo.is_user_member_of_task_project(
+                task_id=task_id, user_id=user_id
+            )
+            self._membership_cache[key] = cached
+        return cached
 
     async def create_comment(
         self,
@@ -37,8 +105,8 @@ class CommentService:
         payload: CommentCreate,
         is_admin: bool = False,
     ) -> Comment:
-        is_active = await self.uow.task_repo.is_task_in_active_project(
-            task_id=task_id
+        is_active, is_member = await self.uow.task_repo.get_comment_preflight(
+            task_id=task_id, user_id=user_id
         )
         if not is_active:
             logger.debug(
@@ -48,11 +116,8 @@ class CommentService:
                 "tidak dapat berkomentar pada proyek yang tidak aktif"
             )
 
+        self._membership_cache[(task_id, user_id)] = is_member
         if not is_admin:
-            is_member = await self.uow.task_repo.is_user_member_of_task_project(
-                task_id=task_id, user_id=user_id
-            )
-
             logger.debug(
                 f"Is user {user_id} member of task {task_id} project? {is_member}"
             )
@@ -86,47 +151,21 @@ class CommentService:
             Sequence[Comment]: Daftar komentar yang ditemukan.
         """
         if not is_admin:
-            is_member = await self.uow.task_repo.is_user_member_of_task_project(
-                task_id=task_id, user_id=user_id
-            )
+            is_member = await self._is_member(task_id=task_id, user_id=user_id)
             if not is_member:
                 raise exceptions.ForbiddenError(
                     "Anda tidak memiliki izin untuk melihat komentar ini"
                 )
 
         comments = await self.uow.comment_repo.list_by_task_id(task_id=task_id)
+        if not comments:
+            return []
+
         user_ids = {comment.user_id for comment in comments}
+        users_by_id = await self._get_users_map(list(user_ids))
 
-        pegawai_service = PegawaiService()
-        users = await pegawai_service.list_user_by_ids(list(user_ids))
-
-        return [
-            CommentDetail(
-                id=comment.id,
-                task_id=comment.task_id,
-                user_id=comment.user_id,
-                content=comment.content,
-                created_at=comment.created_at,
-                profile_url=next(
-                    (
-                        user.profile_url
-                        for user in users
-                        if user and user.id == comment.user_id
-                    ),
-                    None,
-                ),
-                user_name=next(
-                    (
-                        user.name
-                        for user in users
-                        if user and user.id == comment.user_id
-                    ),
-                    None,
-                ),
-                attachments=list(comment.attachments),  # type: ignore # auto cast
-            )
-            for comment in comments
-        ]
+        build = self._build_detail
+        return [build(c, users_by_id) for c in comments]
 
     async def list_comments_with_audits(
         self,
@@ -146,103 +185,89 @@ class CommentService:
 
         # Cek permisi
         if not is_admin:
-            is_member = await self.uow.task_repo.is_user_member_of_task_project(
-                task_id=task_id, user_id=user_id
-            )
+            is_member = await self._is_member(task_id=task_id, user_id=user_id)
             if not is_member:
                 raise exceptions.ForbiddenError(
                     "Anda tidak memiliki izin untuk melihat komentar ini"
                 )
 
-        # Ambil komentar mentah dan audit terlebih dahulu
+        # Ambil komentar mentah terlebih dahulu
         comments = await self.uow.comment_repo.list_by_task_id(task_id=task_id)
 
-        audits = []
-        if include_audits:
-            audits = await self._get_audits_raw(task_id)
-
-        # Kumpulkan semua id pengguna (penulis komentar + pelaksana audit)
-        user_ids: set[int] = {c.user_id for c in comments}
-        user_ids.update(
-            x.performed_by for x in audits if getattr(x, "performed_by", None)
-        )
-
-        # Memperkaya pengguna melalui satu panggilan
+        if not include_audits:
+            if not comments:
+                return []
+            users_by_id = await self._get_users_map(
+                list({c.user_id for c in comments})
+            )
+            build = self._build_detail
+            return [
+                CommentWithCommentRead(type="comment", data=build(c, users_by_id))
+                for c in comments
+            ]
+
+        # Ambil audit dulu agar penulis komentar dan pelaksana audit cukup
+        # di-resolve dengan satu panggilan bulk ke API pegawai
+        audits = await self._get_audits_raw(task_id)
+        user_ids = {c.user_id for c in comments}
+        user_ids.update(a.performed_by for a in audits if a.performed_by)
         users_by_id = await self._get_users_map(list(user_ids))
 
-        # Membuat komentar
-        comment_items: list[CommentWithCommentRead] = []
-        for comment in comments:
-            u = users_by_id.get(comment.user_id)
-            detail = CommentDetail(
-                id=comment.id,
-                task_id=comment.task_id,
-                user_id=comment.user_id,
-                content=comment.content,
-                created_at=comment.created_at,
-                profile_url=(u.profile_url if u else None),
-                user_name=(u.name if u else None),
-                attachments=list(comment.attachments),  # type: ignore
-            )
-            comment_items.append(CommentWithCommentRead(type="comment", data=detail))
-
-        # Membuar audit
-        audit_items: list[CommentWithAuditRead] = []
-        if include_audits:
-            for audit in audits:
-                audit_schema = self._map_audit_to_schema(audit, users_by_id)
-                audit_items.append(
-                    CommentWithAuditRead(type="audit", data=audit_schema)
+        # Komentar dan audit sudah terurut dari repository berdasarkan waktu
+        # pembuatan, cukup digabung tanpa sort ulang
+        build = self._build_detail
+        map_audit = self._map_audit_to_schema
+        merged = heapq.merge(
+            (
+                (
+                    c.created_at,
+                    CommentWithCommentRead(
+                        type="comment", data=build(c, users_by_id)
+                    ),
                 )
-
-        # Gabungkan dan urutkan berdasarkan waktu pembuatan
-        combined: list[tuple] = []
-        for item in comment_items:
-            combined.append((item.data.created_at, item))
-        for idx in range(len(audits)):
-            combined.append((audits[idx].created_at, audit_items[idx]))
-
-        combined.sort(key=lambda x: x[0])
-        return [item for _, item in combined]
+                for c in comments
+            ),
+            (
+                (
+                    a.created_at,
+                    CommentWithAuditRead(
+                        type="audit", data=map_audit(a, users_by_id)
+                    ),
+                )
+                for a in audits
+            ),
+            key=lambda x: x[0],
+        )
+        return [item for _, item in merged]
+
+    def _build_detail(
+        self, comment: Comment, users_by_id: Mapping[int, UserBase]
+    ) -> CommentDetail:
+        # Data berasal dari baris DB yang sudah valid, jadi validasi pydantic
+        # dilewati; lampiran tetap dikonversi ke schema agar bisa diserialisasi.
+        u = users_by_id.get(comment.user_id)
+        return CommentDetail.model_construct(
+            id=comment.id,
+            task_id=comment.task_id,
+            user_id=comment.user_id,
+            content=comment.content,
+            created_at=comment.created_at,
+            profile_url=(u.profile_url if u else None),
+            user_name=(u.name if u else None),
+            attachments=[
+                AttachmentRead.model_validate(a) for a in comment.attachments
+            ],
+        )
 
     async def _get_users_map(self, user_ids: list[int]) -> dict[int, UserBase]:
         if not user_ids:
             return {}
-        pegawai_service = PegawaiService()
-        users = await pegawai_service.list_user_by_ids(user_ids)
+        users = await self.pegawai_service.list_user_by_ids(user_ids)
         return {u.id: u for u in users if u}
 
     async def _get_audits_raw(self, task_id: int):
-        event_types = [
-            EventType.TASK_STATUS_CHANGED.value,
-            EventType.TASK_TITLE_CHANGED.value,
-            EventType.TASK_ASSIGNED_ADDED.value,
-            EventType.TASK_ASSIGNED_REMOVED.value,
-        ]
         return await self.uow.audit_repo.list_task_audits(
-            task_id=task_id, event_types=event_types
-        )
-
-    def _map_audit_details(self, atype: EventType, details: dict | None):
-        d = details or {}
-        if atype == EventType.TASK_STATUS_CHANGED:
-            return TaskStatusChangeAuditSchema(
-                old_status=str(d.get("old_status", "")),
-                new_status=str(d.get("new_status", "")),
-            )
-        if atype == EventType.TASK_TITLE_CHANGED:
-            return TaskTitleChangeAuditSchema(
-                before=str(d.get("before", "")),
-                after=str(d.get("after", "")),
-            )
-        if atype == EventType.TASK_ASSIGNED_ADDED:
-            return TaskAssignAddedAuditSchama(
-                assignee_id=str(d.get("assignee_id", "")),
-                assignee_name=str(d.get("assignee_name", "")),
-            )
-        return TaskAssignRemovedAuditSchama(
-            assignee_id=str(d.get("assignee_id", "")),
-            assignee_name=str(d.get("assignee_name", "")),
+            task_id=task_id, event_types=_AUDIT_EVENT_TYPES
         )
 
     def _map_audit_to_schema(
@@ -250,18 +275,20 @@ class CommentService:
         audit: AuditLog,
         users_by_id: Mapping[int, UserBase],
     ) -> TaskAuditSchema:
-        atype = EventType(audit.action_type)
-        det = self._map_audit_details(atype, getattr(audit, "details", None))
-        performer = users_by_id.get(audit.performed_by or 0)
-        user_name = performer.name if performer else ""
+        atype = audit.action_type
+        builder = _AUDIT_BUILDERS.get(atype, _assign_removed_details)
+        det = builder(audit.details or _EMPTY_DETAILS)
+        performed_by = audit.performed_by or 0
+        performer = users_by_id.get(performed_by)
+        created_at = audit.created_at
 
         return TaskAuditSchema(
-            audit_id=getattr(audit, "id", 0) or 0,
-            user_id=getattr(audit, "performed_by", 0) or 0,
+            audit_id=audit.id or 0,
+            user_id=performed_by,
             profile_url=performer.profile_url if performer else "",
-            user_name=user_name,
+            user_name=performer.name if performer else "",
             task_id=str(audit.task_id) if audit.task_id is not None else "",
-            created_at=(audit.created_at.isoformat() if audit.created_at else ""),
+            created_at=(created_at.isoformat() if created_at else ""),
             action_type=cast(TaskActionType, atype),
             details=det,
         )
@@ -285,9 +312,7 @@ class CommentService:
         Returns:
             Optional[Comment]: Komentar yang ditemukan, atau None jika tidak ada.
         """
-        is_member = await self.uow.task_repo.is_user_member_of_task_project(
-            user_id, task_id
-        )
+        is_member = await self._is_member(task_id=task_id, user_id=user_id)
         if not is_member and not is_admin:
             logger.debug(
                 f"User {user_id} is not allowed to view comment {comment_id}"
@@ -320,38 +345,31 @@ class CommentService:
         Returns:
             bool: True jika komentar berhasil dihapus, False jika tidak.
         """
-        # Ambil komentar terlebih dahulu untuk cek kepemilikan
-        comment = await self.uow.comment_repo.get_by_id_in_task(
-            comment_id=comment_id, task_id=task_id
-        )
-        if not comment:
-            raise exceptions.CommentNotFoundError
-
-        # Admin selalu boleh
+        # Admin selalu boleh, langsung hapus tanpa mengambil komentar
         if is_admin:
             logger.info(f"Admin {user_id} is deleting comment {comment_id}")
-            return await self.uow.comment_repo.delete_by_id_in_task(
-                comment_id=comment_id, task_id=task_id
-            )
-
-        # Pembuat komentar boleh
-        if comment.user_id == user_id:
-            logger.info(f"User {user_id} is deleting their own comment {comment_id}")
-            return await self.uow.comment_repo.delete_by_id_in_task(
+            deleted = await self.uow.comment_repo.delete_by_id_in_task(
                 comment_id=comment_id, task_id=task_id
             )
+            if not deleted:
+                raise exceptions.CommentNotFoundError
+            return deleted
 
-        # Owner project tempat task berada juga boleh
-        is_owner = await self.uow.task_repo.is_user_owner_of_tasks_project(
-            user_id, task_id
+        # Ambil komentar sekaligus status owner project dalam satu query
+        comment, is_owner = await self.uow.comment_repo.get_with_ownership(
+            comment_id=comment_id, task_id=task_id, user_id=user_id
         )
-        if not is_owner:
+        if not comment:
+            raise exceptions.CommentNotFoundError
+
+        # Pembuat komentar dan owner project tempat task berada boleh
+        if comment.user_id != user_id and not is_owner:
             # Tidak memenuhi salah satu kriteria
             raise exceptions.ForbiddenError(
                 "Anda tidak memiliki izin untuk menghapus komentar ini"
             )
 
-        logger.info(f"Owner {user_id} is deleting comment {comment_id}")
+        logger.info(f"User {user_id} is deleting comment {comment_id}")
         return await self.uow.comment_repo.delete_by_id_in_task(
             comment_id=comment_id, task_id=task_id
         )
@@ -1,3 +1,5 @@
+import heapq
+from collections import Counter
 from datetime import date, timedelta
 from typing import TYPE_CHECKING
 
@@ -16,9 +18,11 @@ from app.schemas.user import UserProjectStats
 
 if TYPE_CHECKING:
     from app.services.project_service import ProjectService
-    from app.services.task_service import TaskService
     from app.services.user_service import UserService
 
+# TaskRead hanya berisi kolom skalar Task, cukup disalin tanpa validasi
+_TASK_FIELDS = tuple(TaskRead.model_fields)
+
 
 class DashboardService:
     def __init__(self, uow: UnitOfWork) -> None:
@@ -40,9 +44,10 @@ class DashboardService:
             start_of_this_month=start_of_this_month
         )
 
-        for user in users:
-            role_counts[user.role] = role_counts.get(user.role, 0) + 1
-        top_users = sorted(users, key=lambda u: u.name, reverse=True)[:limit]
+        # Role dan top user dihitung dari daftar yang sama; nama user hanya ada
+        # di layanan pegawai sehingga tidak bisa diurutkan di database
+        role_counts.update(Counter(user.role for user in users))
+        top_users = heapq.nlargest(limit, users, key=lambda u: u.name)
         return AdminDashboardResponse(
             top_users=top_users,
             role_counts=role_counts,
@@ -66,11 +71,10 @@ class DashboardService:
         start_of_this_month = today.replace(day=1)
         one_year_ago = today - timedelta(days=365)
 
-        summary = await self.repo.get_pm_project_status_summary(
-            user_id=user_id, start_of_this_month=start_of_this_month
-        )
-        yearly_rows = await self.repo.get_pm_yearly_project_summary(
-            user_id=user_id, one_year_ago=one_year_ago
+        summary, yearly_rows = await self.repo.get_pm_dashboard_summary(
+            user_id=user_id,
+            start_of_this_month=start_of_this_month,
+            one_year_ago=one_year_ago,
         )
         upcoming_deadlines_rows = await self.repo.list_pm_upcoming_project_deadlines(
             user_id=user_id, skip=skip_deadline, limit=limit_deadline
@@ -110,30 +114,19 @@ class DashboardService:
     async def user_dashboard(
         self,
         user_id: int,
-        task_service: "TaskService",
-        project_service: "ProjectService",
         limit_tasks: int = 5,
     ) -> UserDashboardResponse:
         """Dashboard User: ringkasan project & tugas, upcoming tasks."""
-        project_stats = await project_service.get_user_project_statistics(user_id)
-        task_stats = await task_service.get_user_task_statistics(user_id)
+        stats = await self.repo.get_user_dashboard_stats(user_id)
+        project_summary = UserProjectStats(**stats)
 
-        project_summary = UserProjectStats(
-            total_project=project_stats.get("total_project", 0),
-            project_active=project_stats.get("project_active", 0),
-            project_completed=project_stats.get("project_completed", 0),
-            total_task=task_stats.get("total_task", 0),
-            task_in_progress=task_stats.get("task_in_progress", 0),
-            task_completed=task_stats.get("task_completed", 0),
-            task_cancelled=task_stats.get("task_cancelled", 0),
-        )
         _upcoming_task_models = await self.repo.list_user_upcoming_tasks(
             user_id=user_id, limit=limit_tasks
         )
 
         # cast ke type SimpleTaskResponse
         upcoming_tasks: list[TaskRead] = [
-            TaskRead.model_validate(t, from_attributes=True)
+            TaskRead.model_construct(**{f: getattr(t, f) for f in _TASK_FIELDS})
             for t in _upcoming_task_models
         ]
 
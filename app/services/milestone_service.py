@@ -1,6 +1,7 @@
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, raiseload, selectinload
 
 from app.db.models.milestone_model import Milestone
 from app.db.models.project_member_model import RoleProject
@@ -15,29 +16,50 @@ from app.schemas.milestone import (
 )
 from app.schemas.task import TaskAssigneeRead
 from app.schemas.user import User, UserBase
-from app.services.pegawai_service import PegawaiService
+from app.services.pegawai_service import PegawaiService, get_pegawai_service
 from app.utils import exceptions
 
+# Urutan kustom untuk sorting; StrEnum bisa langsung dipakai sebagai key
+_PRIORITY_ORDER: Mapping[str, int] = MappingProxyType(
+    {"low": 0, "medium": 1, "high": 2}
+)
+_STATUS_ORDER: Mapping[str, int] = MappingProxyType(
+    {"pending": 0, "cancelled": 0, "in_progress": 2, "completed": 3}
+)
+
+# Opsi loader bersifat immutable sehingga cukup dibangun sekali saat import.
+# Hanya task level atas yang dimuat ke Milestone.tasks, sub-task dimuat lewat
+# Task.sub_tasks. Sub-task memakai alias karena kriteria parent_id IS NULL pada
+# entitas Task ikut terbawa ke query relasi self-referential Task.sub_tasks.
+# Relasi lain di setiap level di-raiseload sehingga akses yang lupa di-eager
+# load langsung gagal, bukan menjadi lazy load per baris.
+_sub_task = aliased(Task)
+_root_tasks = selectinload(Milestone.tasks.and_(Task.parent_id.is_(None)))
+_sub_tasks = _root_tasks.selectinload(Task.sub_tasks.of_type(_sub_task))
+_MILESTONE_EAGER_OPTS = (
+    raiseload("*"),
+    _root_tasks.raiseload("*"),
+    _root_tasks.selectinload(Task.assignees).raiseload("*"),
+    _sub_tasks.raiseload("*"),
+    _sub_tasks.selectinload(_sub_task.assignees).raiseload("*"),
+)
+
 
 class MilestoneService:
-    def __init__(self, uow: UnitOfWork):
+    def __init__(
+        self, uow: UnitOfWork, pegawai_service: PegawaiService | None = None
+    ):
         self.uow = uow
         self.repo = self.uow.milestone_repo
+        self.pegawai_service = pegawai_service or get_pegawai_service()
 
-    def _eager_options(self):
+    def _eager_options(self) -> tuple[Any, ...]:
         """Mendapatkan opsi eager loading untuk query milestone.
 
         Returns:
-            list: Daftar opsi eager loading.
+            tuple[Any, ...]: Daftar opsi eager loading.
         """
-        return [
-            selectinload(Milestone.tasks),
-            selectinload(Milestone.tasks).selectinload(Task.assignees),
-            selectinload(Milestone.tasks).selectinload(Task.sub_tasks),
-            selectinload(Milestone.tasks)
-            .selectinload(Task.sub_tasks)
-            .selectinload(Task.assignees),
-        ]
+        return _MILESTONE_EAGER_OPTS
 
     async def _ensure_member(self, *, user: User, project_id: int) -> None:
         """Memastikan bahwa pengguna adalah anggota proyek.
@@ -73,14 +95,12 @@ class MilestoneService:
         Returns:
             list[Milestone]: Daftar milestone yang terkait dengan proyek.
         """
+        # Repository sudah mengurutkan berdasarkan display_order (desc)
         opts = self._eager_options()
-        milestones = await self.repo.list_by_project(
+        return await self.repo.list_by_project(
             project_id=project_id,
-            custom_query=lambda q: q.options(*opts).order_by(
-                Milestone.display_order.asc()
-            ),
+            custom_query=lambda q: q.options(*opts),
         )
-        return sorted(milestones, key=lambda m: m.display_order, reverse=True)
 
     @staticmethod
     def _collect_assignee_ids(milestones: list[Milestone]) -> set[int]:
@@ -92,19 +112,9 @@ class MilestoneService:
         Returns:
             set[int]: Kumpulan ID pengguna yang ditugaskan.
         """
-        ids: set[int] = set()
-        for m in milestones:
-            for t in m.tasks or []:
-                for a in t.assignees or []:
-                    uid = getattr(a, "user_id", None)
-                    if uid is not None:
-                        ids.add(uid)
-                for st in t.sub_tasks or []:
-                    for a in st.assignees or []:
-                        uid = getattr(a, "user_id", None)
-                        if uid is not None:
-                            ids.add(uid)
-        return ids
+        tasks = [t for m in milestones for t in m.tasks]
+        tasks += [st for t in tasks for st in t.sub_tasks]
+        return {a.user_id for t in tasks for a in t.assignees}
 
     async def _get_user_info_map(
         self, assignee_ids: set[int]
@@ -119,9 +129,8 @@ class MilestoneService:
         """
         if not assignee_ids:
             return {}
-        pegawai_service = PegawaiService()
         unique_ids = sorted(assignee_ids)
-        users = await pegawai_service.list_user_by_ids(unique_ids)
+        users = await self.pegawai_service.list_user_by_ids(unique_ids)
         return dict(zip(unique_ids, users, strict=False))
 
     @staticmethod
@@ -144,7 +153,7 @@ class MilestoneService:
             if info is None:
                 continue
             items.append(
-                TaskAssigneeRead(
+                TaskAssigneeRead.model_construct(
                     user_id=info.id,
                     name=info.name,
                     email=info.email or "",
@@ -166,7 +175,7 @@ class MilestoneService:
         Returns:
             MilestoneSubtaskResponse: Respons sub-tugas yang dipetakan.
         """
-        return MilestoneSubTaskRead(
+        return MilestoneSubTaskRead.model_construct(
             id=st.id,
             name=st.name,
             status=st.status,
@@ -203,7 +212,7 @@ class MilestoneService:
         sub_tasks_resp = [
             self._map_subtask(st, user_info_map) for st in sub_tasks_sorted
         ]
-        return MilestoneTaskRead(
+        return MilestoneTaskRead.model_construct(
             id=t.id,
             name=t.name,
             status=t.status,
@@ -233,8 +242,9 @@ class MilestoneService:
         Returns:
             MilestoneResponse: Respons milestone yang dipetakan.
         """
+        # m.tasks hanya berisi task level atas (lihat _eager_options)
         top_level_tasks = sorted(
-            (t for t in (m.tasks or []) if getattr(t, "parent_id", None) is None),
+            (m.tasks or []),
             key=lambda t: self._sort_key(t, sort_by, descending),
             reverse=descending,
         )
@@ -247,7 +257,7 @@ class MilestoneService:
             )
             for t in top_level_tasks
         ]
-        return MilestoneDetail(
+        return MilestoneDetail.model_construct(
             id=m.id,
             project_id=m.project_id,
             title=m.title,
@@ -262,16 +272,20 @@ class MilestoneService:
         """Custom order: low < medium < high."""
         if value is None:
             return 999
-        order = {"low": 0, "medium": 1, "high": 2}
-        return order.get(str(value).lower(), 999)
+        rank = _PRIORITY_ORDER.get(value)
+        if rank is None:
+            rank = _PRIORITY_ORDER.get(str(value).lower(), 999)
+        return rank
 
     @staticmethod
     def _status_rank(value: Any) -> int:
         """Custom order: todo < in_progress < done."""
         if value is None:
             return 999
-        order = {"pending": 0, "cancelled": 0, "in_progress": 2, "completed": 3}
-        return order.get(str(value).lower(), 999)
+        rank = _STATUS_ORDER.get(value)
+        if rank is None:
+            rank = _STATUS_ORDER.get(str(value).lower(), 999)
+        return rank
 
     def _primary_key(self, value: Any, field: str) -> Any:
         if field == "priority":
@@ -357,12 +371,15 @@ class MilestoneService:
                 "Hanya owner proyek yang dapat membuat milestone"
             )
 
-        milestone_data = payload.model_dump()
-        milestone_data["project_id"] = project_id
-        milestone_data["display_order"] = await self.repo.validate_display_order(
+        display_order = await self.repo.validate_display_order(
             project_id=project_id, display_order=None
         )
-        return await self.repo.create_milestone(payload=milestone_data)
+        # dict(payload) menyalin field secara dangkal tanpa serialisasi model_dump
+        return await self.repo.create_milestone(
+            payload=dict(
+                payload, project_id=project_id, display_order=display_order
+            )
+        )
 
     async def delete_milestone(self, *, user: User, milestone_id: int) -> bool:
         """Menghapus milestone berdasarkan ID dan project.
@@ -379,27 +396,23 @@ class MilestoneService:
         Returns:
             bool: True jika milestone berhasil dihapus, False jika tidak ditemukan.
         """
-        milestone = await self.repo.get_by_id(
-            milestone_id=milestone_id, options=[selectinload(Milestone.tasks)]
+        milestone, is_owner, has_tasks = await self.repo.get_with_ownership(
+            milestone_id=milestone_id, user_id=user.id
         )
         if not milestone:
             raise exceptions.MilestoneNotFoundError("Milestone tidak ditemukan")
 
-        is_owner = await self.uow.project_repo.is_user_owner_of_project(
-            project_id=milestone.project_id, user_id=user.id
-        )
-
         if not is_owner:
             raise exceptions.ForbiddenError(
                 "Hanya owner proyek yang dapat menghapus milestone"
             )
 
-        if milestone.tasks:
+        if has_tasks:
             raise exceptions.ForbiddenError(
                 "Tidak dapat menghapus milestone yang memiliki task"
             )
 
-        result = await self.repo.delete(milestone=milestone)
+        result = await self.repo.delete(milestone_id=milestone.id)
         if not result:
             raise exceptions.MilestoneNotFoundError("Milestone tidak ditemukan")
         return result
@@ -421,16 +434,12 @@ class MilestoneService:
         Returns:
             bool: True jika milestone berhasil dihapus, False jika tidak ditemukan.
         """
-        milestone = await self.repo.get_by_id(
-            milestone_id=milestone_id, options=[selectinload(Milestone.tasks)]
+        milestone, is_owner, _ = await self.repo.get_with_ownership(
+            milestone_id=milestone_id, user_id=user.id
         )
         if not milestone:
             raise exceptions.MilestoneNotFoundError("Milestone tidak ditemukan")
 
-        is_owner = await self.uow.project_repo.is_user_owner_of_project(
-            project_id=milestone.project_id, user_id=user.id
-        )
-
         if not is_owner:
             raise exceptions.ForbiddenError(
                 "Hanya owner proyek yang dapat menghapus milestone"
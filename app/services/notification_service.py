@@ -4,13 +4,16 @@ from typing import Literal
 
 from app.db.uow.sqlalchemy import UnitOfWork
 from app.schemas.notification import NotificationRead
-from app.services.pegawai_service import PegawaiService
+from app.services.pegawai_service import PegawaiService, get_pegawai_service
 from app.utils import exceptions
 
 
 class NotificationService:
-    def __init__(self, uow: UnitOfWork) -> None:
+    def __init__(
+        self, uow: UnitOfWork, pegawai_service: PegawaiService | None = None
+    ) -> None:
         self.uow = uow
+        self.pegawai_service = pegawai_service or get_pegawai_service()
 
     async def list_notifications(
         self,
@@ -31,20 +34,16 @@ class NotificationService:
         )
 
         actor_ids = list({n.actor_id for n in notifs})
-        pegawai = PegawaiService()
-        actors = await pegawai.list_user_by_ids(actor_ids)
-
-        def actor_info(user_id: int):
-            for u in actors:
-                if u and u.id == user_id:
-                    return u.name or "", getattr(u, "profile_url", None)
-            return "", None
+        actors = await self.pegawai_service.list_user_by_ids(actor_ids)
+        actor_map = {u.id: u for u in actors if u}
 
         items: list[NotificationRead] = []
         for n in notifs:
-            a_name, a_profile = actor_info(n.actor_id)
+            u = actor_map.get(n.actor_id)
+            a_name = (u.name or "") if u else ""
+            a_profile = u.profile_url if u else None
             items.append(
-                NotificationRead(
+                NotificationRead.model_construct(
                     id=n.id,
                     recipient_id=n.recipient_id,
                     type=n.type,
@@ -78,8 +77,7 @@ class NotificationService:
         notif = await self.uow.notification_repo.mark_read(notif=notif)
 
         # enrich actor info
-        pegawai = PegawaiService()
-        actor = (await pegawai.list_user_by_ids([notif.actor_id]))[0]
+        actor = (await self.pegawai_service.list_user_by_ids([notif.actor_id]))[0]
         actor_name = actor.name if actor else ""
         actor_profile = getattr(actor, "profile_url", None) if actor else None
 
@@ -1,20 +1,92 @@
 import asyncio
+import functools
+import hashlib
 import logging
-import urllib.parse
+from typing import Any
+from urllib.parse import quote_plus
 
 from starlette_context import context
 
 from app.client import PegawaiApiClient
+from app.middleware.request_middleware import request_object
 from app.schemas.user import UserBase
+from app.utils.cache import SingleFlight, TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Penanda key tidak ada di cache, karena None adalah nilai cache yang sah
+_MISSING = object()
+
+# Jumlah ID maksimal per request bulk ke layanan pegawai; daftar yang lebih
+# besar dipecah dan diambil paralel.
+BULK_CHUNK_SIZE = 100
+
+# Cache user per proses (lintas request) berdasarkan ID, berlaku singkat agar
+# perubahan data di layanan pegawai tetap cepat terlihat.
+_USER_CACHE: TTLCache[int, UserBase] = TTLCache(maxsize=10_000, ttl=30)
+
+# Cache token yang sudah tervalidasi per proses. Key berupa hash token sehingga
+# token mentah tidak tersimpan di memori cache.
+_TOKEN_VALID_CACHE: TTLCache[str, bool] = TTLCache(maxsize=4096, ttl=60)
+
+# Profil pemilik token (/pegawai/me) per proses, dengan key hash token yang sama.
+_ME_CACHE: TTLCache[str, UserBase] = TTLCache(maxsize=2048, ttl=30)
+
+# Request identik yang sedang berjalan ke layanan pegawai digabung menjadi satu.
+# Key selalu memuat hash kredensial yang dipakai ke upstream.
+_INFLIGHT: SingleFlight[tuple[Any, ...], Any] = SingleFlight()
+
+
+_AVATAR_PREFIX = "https://ui-avatars.com/api/?name="
+_AVATAR_SUFFIX = "&background=random&bold=true&size=256"
+
+
+@functools.lru_cache(maxsize=4096)
+def _avatar_url(name: str) -> str:
+    """URL avatar dummy (ui-avatars) untuk user tanpa foto profil.
+
+    Nama yang sama selalu menghasilkan URL yang sama, jadi hasilnya di-cache.
+    """
+    return _AVATAR_PREFIX + quote_plus(name.strip()) + _AVATAR_SUFFIX
+
+
+def _token_key(token: str) -> str:
+    """Hash token menjadi key cache yang pendek dan tidak dapat dibalik."""
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+def _forget_token(hkey: str) -> None:
+    """Buang hasil cache lintas request untuk token yang ditolak upstream.
+
+    Client tidak membedakan 401 dari error jaringan (keduanya False/None),
+    sehingga entri dibuang pada kegagalan apa pun; paling buruk hanya memicu
+    fetch ulang.
+    """
+    _TOKEN_VALID_CACHE.pop(hkey)
+    _ME_CACHE.pop(hkey)
+
+
+def _caller_key() -> str:
+    """Hash header Authorization milik request aktif.
+
+    Panggilan upstream tanpa token eksplisit memakai header request pemanggil
+    pertama, jadi hanya request dengan kredensial yang sama yang boleh ikut
+    menunggu hasilnya.
+    """
+    req = request_object.get(None)
+    auth = req.headers.get("authorization", "") if req is not None else ""
+    return _token_key(auth)
+
 
 class PegawaiService:
-    def __init__(self) -> None:
-        # menggunakan aiohttp client sebagai default
-        # bisa juga menggunakan httpx client jika diperlukan
-        self.client = PegawaiApiClient
+    # Service tidak menyimpan state per instance; seluruh cache ada di level
+    # modul/request sehingga instance cukup tanpa __dict__.
+    __slots__ = ()
+
+    # menggunakan httpx client sebagai default, bisa juga diganti dengan
+    # PegawaiAiohttpClient jika diperlukan. Client bersifat stateless
+    # (staticmethod) sehingga cukup disimpan di level kelas.
+    client = PegawaiApiClient
 
     def _get_ctx_cache(self) -> dict:
         """
@@ -40,13 +112,30 @@ class PegawaiService:
         """
 
         cache = self._get_ctx_cache()
-        tkey = f"token_valid:{token}"
-        if tkey in cache:
-            return bool(cache[tkey])
-
-        result = await asyncio.gather(self.client.validation_token(token=token))
-        is_valid = bool(result[0])
+        hkey = _token_key(token)
+        tkey = f"token_valid:{hkey}"
+        cached = cache.get(tkey, _MISSING)
+        if cached is not _MISSING:
+            return bool(cached)
+
+        cached = _TOKEN_VALID_CACHE.get(hkey)
+        if cached is not None:
+            cache[tkey] = cached
+            return cached
+
+        is_valid = bool(
+            await _INFLIGHT.do(
+                ("validation", hkey),
+                lambda: self.client.validation_token(token=token),
+            )
+        )
         cache[tkey] = is_valid
+        # Hanya hasil valid yang disimpan lintas request; False juga dipakai
+        # client untuk error jaringan sehingga tidak boleh ditahan selama TTL.
+        if is_valid:
+            _TOKEN_VALID_CACHE.set(hkey, True)
+        else:
+            _forget_token(hkey)
         return is_valid
 
     async def get_user_info(self, user_id: int):
@@ -60,18 +149,19 @@ class PegawaiService:
         """
         cache = self._get_ctx_cache()
         ckey = f"id:{user_id}"
-        if ckey in cache:
-            logger.debug(f"Cache hit for user_id {user_id}")
-            return cache[ckey]
-
-        result = await asyncio.gather(
-            self.client.get_pegawai_detail(user_id=user_id)
+        cached = cache.get(ckey, _MISSING)
+        if cached is not _MISSING:
+            logger.debug("Cache hit for user_id %s", user_id)
+            return cached
+
+        user = await _INFLIGHT.do(
+            ("detail", _caller_key(), user_id),
+            lambda: self.client.get_pegawai_detail(user_id=user_id),
         )
-        user = result[0]
         if not user:
             cache[ckey] = None
             return None
-        mapped = await self.map_to_pegawai_info(user.copy())
+        mapped = self.map_to_pegawai_info(user)
         cache[ckey] = mapped
         return mapped
 
@@ -86,19 +176,34 @@ class PegawaiService:
             UserBase | None: Objek informasi pegawai jika ditemukan, None jika tidak.
         """
         cache = self._get_ctx_cache()
-        tkey = f"token:{token}"
-        if tkey in cache:
-            return cache[tkey]
-
-        result = await asyncio.gather(self.client.get_pegawai_me(token=token))
-        user = result[0]
+        hkey = _token_key(token)
+        tkey = f"token:{hkey}"
+        cached = cache.get(tkey, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        # Instance di cache proses tidak pernah diberikan langsung ke pemanggil,
+        # agar perubahan oleh satu request tidak terlihat di request lain.
+        shared = _ME_CACHE.get(hkey)
+        if shared is not None:
+            mapped = shared.model_copy()
+            cache[tkey] = mapped
+            cache[f"id:{mapped.id}"] = mapped
+            return mapped
+
+        user = await _INFLIGHT.do(
+            ("me", hkey), lambda: self.client.get_pegawai_me(token=token)
+        )
 
         if not user:
+            # token ditolak upstream: jangan biarkan cache lain masih menerimanya
+            _forget_token(hkey)
             cache[tkey] = None
             return None
 
-        mapped = await self.map_to_pegawai_info(user.copy())
+        mapped = self.map_to_pegawai_info(user)
         cache[tkey] = mapped
+        _ME_CACHE.set(hkey, mapped.model_copy())
 
         # simpan juga berdasarkan id jika tersedia
         uid = getattr(mapped, "id", None)
@@ -118,12 +223,18 @@ class PegawaiService:
                 jika sukses; None jika gagal/format tak sesuai.
         """
         payload = {"email": email, "password": password}
-        result = await asyncio.gather(self.client.login(payload=payload))
-        return result[0]
+        return await self.client.login(payload=payload)
 
-    async def map_to_pegawai_info(self, data):
+    def map_to_pegawai_info(self, data):
         """Map API response to UserBase.
 
+        Hanya membaca ``data`` (tidak mengubahnya), sehingga pemanggil boleh
+        mengoper dict response apa adanya tanpa disalin.
+
+        Response API pegawai dianggap terpercaya, sehingga ``UserBase``
+        dibangun dengan ``model_construct`` tanpa validasi Pydantic. Field
+        string yang kosong di response diisi ``""`` agar tipe tetap sesuai.
+
         Args:
             data (dict): API response data.
 
@@ -131,33 +242,32 @@ class PegawaiService:
             UserBase: Mapped UserBase object.
         """
         role = data.get("role")
+        email = data.get("email")
+        pegawai = data.get("pegawai")
 
         if role == "admin":
-            name = data.get("email", "")
-            position = role or ""
-        else:
+            name = email or ""
+            position = role
+        elif pegawai:
             # handle pegawai biasa
-            pegawai = data.get("pegawai") or {
-                "nama": data.get("email", ""),
-                "position": data.get("position", role),
-            }
-
             name = pegawai.get("nama", pegawai.get("nama_lengkap", ""))
             position = pegawai.get("jabatan", "")
+        else:
+            # akun tanpa data pegawai, pakai email sebagai nama
+            name = email or ""
+            position = ""
 
         # handle profile_url
         profile_photo_path = data.get("profile_photo_path", None)
         if not profile_photo_path:
-            safe_name = name.strip()
-            encoded_name = urllib.parse.quote_plus(safe_name)
-            profile_photo_path = f"https://ui-avatars.com/api/?name={encoded_name}&background=random&bold=true&size=256"
+            profile_photo_path = _avatar_url(name)
 
-        return UserBase(
+        return UserBase.model_construct(
             id=data.get("id"),
-            name=name,
-            employee_role=data.get("role"),
-            email=data.get("email"),
-            position=position,
+            name=name or "",
+            employee_role=role or "",
+            email=email or "",
+            position=position or "",
             profile_url=profile_photo_path,
         )
 
@@ -182,7 +292,7 @@ class PegawaiService:
                 page=page, per_page=per_page, search=search
             )
 
-        result = (await asyncio.gather(fetch_coro))[0]
+        result = await fetch_coro
         if not result:
             return {"data": []}
 
@@ -190,7 +300,7 @@ class PegawaiService:
         cache = self._get_ctx_cache()
         mapped_list: list[UserBase] = []
         for raw in users_raw:
-            mapped = await self.map_to_pegawai_info(raw)
+            mapped = self.map_to_pegawai_info(raw)
             mapped_list.append(mapped)
             uid = getattr(mapped, "id", None)
             if uid is not None:
@@ -214,23 +324,37 @@ class PegawaiService:
 
         cache = self._get_ctx_cache()
 
-        # Ambil dari cache dulu
-        result_list: list[UserBase | None] = []
-        missing_ids: list[int] = []
-        for uid in data:
-            cval = cache.get(f"id:{uid}")
-            if cval is None and f"id:{uid}" not in cache:
-                missing_ids.append(uid)
-            result_list.append(cval if f"id:{uid}" in cache else None)
-
-        logger.debug("Cache miss for user_id %s (need fetch)", missing_ids)
+        # Ambil dari cache dulu, ID duplikat cukup dicek sekali
+        by_id: dict[int, UserBase | None] = {}
+        # uid -> key cache, dibuat sekali dan dipakai lagi saat menulis hasil
+        missing: dict[int, str] = {}
+        for uid in dict.fromkeys(data):
+            ckey = f"id:{uid}"
+            # satu probe: None yang tersimpan berarti user memang tidak ada
+            cval = cache.get(ckey, _MISSING)
+            if cval is _MISSING:
+                shared = _USER_CACHE.get(uid)
+                if shared is None:
+                    missing[uid] = ckey
+                    continue
+                # salinan, agar instance di cache proses tidak ikut berubah
+                cval = cache[ckey] = shared.model_copy()
+            by_id[uid] = cval
+
+        logger.debug("Cache miss for user_id %s (need fetch)", list(missing))
 
         # Fetch yang belum ada
         fetched: list[dict | None] = []
-        if missing_ids:
-            fetched = (
-                await asyncio.gather(self.client.get_bulk_pegawai(ids=missing_ids))
-            )[0] or []
+        if missing:
+            missing_ids = list(missing)
+            chunks = [
+                missing_ids[i : i + BULK_CHUNK_SIZE]
+                for i in range(0, len(missing_ids), BULK_CHUNK_SIZE)
+            ]
+            results = await asyncio.gather(
+                *(self.client.get_bulk_pegawai(ids=chunk) for chunk in chunks)
+            )
+            fetched = [raw for res in results for raw in (res or [])]
 
             logger.debug("Fetched %d users from Pegawai service", len(fetched))
 
@@ -238,28 +362,29 @@ class PegawaiService:
         for raw in fetched:
             if not raw:
                 continue
-            mapped = await self.map_to_pegawai_info(raw)
+            mapped = self.map_to_pegawai_info(raw)
             uid = getattr(mapped, "id", None)
             if uid is not None:
-                cache[f"id:{uid}"] = mapped
-                # Perbarui result_list pada posisi yang sesuai jika index ada
-                try:
-                    idx = data.index(uid)
-                    result_list[idx] = mapped  # type: ignore
-                except ValueError:
-                    pass
-        return result_list
+                cache[missing.pop(uid, None) or f"id:{uid}"] = mapped
+                _USER_CACHE.set(uid, mapped.model_copy())
+                by_id[uid] = mapped
 
+        # ID yang tidak dikembalikan layanan pegawai dicatat None untuk sisa
+        # request ini, sama seperti get_user_info
+        for ckey in missing.values():
+            cache[ckey] = None
 
-def _singleton(cls):
-    _instances = {}
+        # Susun ulang sesuai urutan ID input
+        return [by_id.get(uid) for uid in data]
 
-    def warp():
-        if cls not in _instances:
-            _instances[cls] = cls()
-        return _instances[cls]
 
-    return warp
+@functools.cache
+def get_pegawai_service() -> PegawaiService:
+    """Mendapatkan instance PegawaiService tunggal untuk seluruh proses.
 
+    Dipakai sebagai dependency FastAPI maupun dari service lain.
 
-PegawaiService = _singleton(PegawaiService)  # type: ignore
+    Returns:
+        PegawaiService: Instance yang sama di setiap pemanggilan.
+    """
+    return PegawaiService()
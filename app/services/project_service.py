@@ -45,7 +45,7 @@ from app.schemas.project import (
     TaskEstimationItem,
 )
 from app.schemas.user import User
-from app.services.pegawai_service import PegawaiService
+from app.services.pegawai_service import get_pegawai_service
 from app.utils import exceptions
 
 logger = logging.getLogger(__name__)
@@ -336,7 +336,7 @@ class ProjectService:
             list[ProjectMemberRead]: Daftar detail anggota proyek.
         """
 
-        pegawai_service = PegawaiService()
+        pegawai_service = get_pegawai_service()
         users = await pegawai_service.list_user_by_ids([m.user_id for m in members])
 
         # TODO: missing user belum di handle. mising user bisa terjadi jika user
@@ -462,14 +462,13 @@ class ProjectService:
             # samakan response dengan "tidak ditemukan/akses"
             raise exceptions.ProjectNotFoundError
 
-        # tidak boleh duplikat member
-        if await self.repo.get_member_by_ids(project_id, member.id):
-            raise exceptions.MemberAlreadyExistsError
-
         # validasi aturan role
         ensure_can_assign_member_role(member.role, role)
 
+        # tidak boleh duplikat member (ditangani ON CONFLICT di repository)
         created = await self.repo.add_project_member(project_id, member.id, role)
+        if created is None:
+            raise exceptions.MemberAlreadyExistsError
 
         self._on_member_added(actor, member, role, project)
         return created
@@ -515,10 +514,6 @@ class ProjectService:
         if not project:
             raise exceptions.ProjectNotFoundError
 
-        # pastikan member ada
-        if not await self.repo.get_member_by_ids(project_id, member.id):
-            raise exceptions.MemberNotFoundError
-
         # validasi aturan penghapusan
         ensure_actor_can_remove_member(
             project_owner_id=project.created_by,
@@ -526,7 +521,9 @@ class ProjectService:
             target_user_id=member.id,
         )
 
-        await self.repo.remove_project_member(project_id, member.id)
+        # hapus langsung; jumlah baris terhapus sekaligus menandakan member ada
+        if not await self.repo.remove_project_member(project_id, member.id):
+            raise exceptions.MemberNotFoundError
 
         self._on_remove_member(actor, member, project)
 
@@ -651,7 +648,7 @@ class ProjectService:
 
         # Fetch user info (assignee) sekali
         assignee_ids = [r["user_id"] for r in assignee_rows]
-        pegawai_service = PegawaiService()
+        pegawai_service = get_pegawai_service()
         users = await pegawai_service.list_user_by_ids(sorted(assignee_ids))
         user_map = {u.id: u for u in users if u}
 
@@ -27,7 +27,7 @@ from app.schemas.task import (
     TaskUpdate,
 )
 from app.schemas.user import User
-from app.services.pegawai_service import PegawaiService
+from app.services.pegawai_service import get_pegawai_service
 from app.utils import exceptions
 
 if TYPE_CHECKING:
@@ -39,7 +39,7 @@ class TaskService:
         self.uow = uow
         self.repo = uow.task_repo
 
-        self.pegawai_service = PegawaiService()
+        self.pegawai_service = get_pegawai_service()
 
     async def get(
         self, task_id: int, *, options: list[Any] | None = None
@@ -4,6 +4,11 @@ from typing import Any, Optional, Unpack
 import aiohttp
 
 SIZE_POOL_AIOHTTP = 100
+# Hampir semua request menuju satu host (layanan pegawai), batasi per host agar
+# pool tidak dimonopoli dan koneksi keep-alive dipakai ulang lebih lama.
+LIMIT_PER_HOST_AIOHTTP = 30
+KEEPALIVE_TIMEOUT_AIOHTTP = 75
+DNS_CACHE_TTL_AIOHTTP = 300
 
 
 class SingletonAiohttp:
@@ -36,7 +41,13 @@ class SingletonAiohttp:
                 except Exception:
                     pass
             timeout = aiohttp.ClientTimeout(total=30)
-            connector = aiohttp.TCPConnector(limit=100, enable_cleanup_closed=True)
+            connector = aiohttp.TCPConnector(
+                limit=SIZE_POOL_AIOHTTP,
+                limit_per_host=LIMIT_PER_HOST_AIOHTTP,
+                ttl_dns_cache=DNS_CACHE_TTL_AIOHTTP,
+                keepalive_timeout=KEEPALIVE_TIMEOUT_AIOHTTP,
+                enable_cleanup_closed=True,
+            )
             cls.aiohttp_client = aiohttp.ClientSession(
                 timeout=timeout, connector=connector, trust_env=True
             )
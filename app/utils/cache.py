@@ -0,0 +1,85 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """Cache in-memory sederhana dengan batas ukuran dan masa berlaku (TTL).
+
+    Ditujukan untuk dipakai di level proses (module-level) pada event loop
+    asyncio. Semua operasi bersifat sinkron sehingga tidak perlu lock selama
+    tidak ada ``await`` di antara baca dan tulis.
+
+    Args:
+        maxsize (int): Jumlah entri maksimal. Entri terlama dibuang saat penuh.
+        ttl (float): Masa berlaku entri dalam detik.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Ambil nilai dari cache, mengembalikan ``default`` jika tidak ada atau
+        sudah kedaluwarsa."""
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return default
+        expires_at, value = item  # type: ignore
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Simpan nilai ke cache dan perbarui masa berlakunya."""
+        if key in self._data:
+            self._data.move_to_end(key)
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        """Hapus entri dari cache (jika ada)."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Kosongkan seluruh isi cache."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight(Generic[K, V]):
+    """Menggabungkan pemanggilan async yang identik dan sedang berjalan.
+
+    Pemanggil pertama untuk sebuah key menjalankan ``factory`` sebagai task
+    terpisah; pemanggil lain dengan key yang sama selama task belum selesai
+    cukup menunggu hasil yang sama. Task di-``shield`` sehingga pembatalan
+    salah satu pemanggil (mis. client disconnect) tidak membatalkan yang lain.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[K, asyncio.Task[V]] = {}
+
+    async def do(self, key: K, factory: Callable[[], Awaitable[V]]) -> V:
+        """Jalankan ``factory`` untuk ``key`` atau ikut menunggu yang sedang
+        berjalan."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: K, task: "asyncio.Task[V]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
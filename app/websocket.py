@@ -20,7 +20,7 @@ from app.db.models.role_model import Role
 from app.db.repositories.user_repository import UserSQLAlchemyRepository
 from app.db.uow.sqlalchemy import SQLAlchemyUnitOfWork
 from app.schemas.user import User
-from app.services.pegawai_service import PegawaiService
+from app.services.pegawai_service import PegawaiService, get_pegawai_service
 from app.services.user_service import UserService
 
 logger = logging.getLogger(__name__)
@@ -72,7 +72,7 @@ async def get_user_from_token(token: str, pegawai_service: PegawaiService):
 
 async def get_current_user_ws(
     access_token: str = Query(...),
-    pegawai_service: PegawaiService = Depends(PegawaiService),
+    pegawai_service: PegawaiService = Depends(get_pegawai_service),
 ):
     """Dependency untuk otentikasi koneksi WebSocket."""
     logger.info("WebSocket access_token: %s", access_token)